@@ -21,11 +21,15 @@ def create_large_rse_test(filename='large_rse_test.h5'):
 
     n_rows = 1_000_000
 
-    with h5py.File(filename, 'w') as f:
+    # Size the chunk cache well above the (131072,) int64 chunks so sequential
+    # writes never evict and re-read chunk B-tree nodes.
+    with h5py.File(filename, 'w', rdcc_nbytes=16 * 1024 * 1024, rdcc_w0=0.75) as f:
         # Regular datasets
-        f.create_dataset('index', data=np.arange(n_rows, dtype=np.int64))
+        # Chunk explicitly along the row axis (~1 MB per chunk for int64) so
+        # range scans can skip chunks instead of reading the whole column.
+        f.create_dataset('index', data=np.arange(n_rows, dtype=np.int64), chunks=(131_072,))
         # values cycles 0-99 (test expects MAX(values) = 99)
-        f.create_dataset('values', data=np.arange(n_rows, dtype=np.int64) % 100)
+        f.create_dataset('values', data=np.arange(n_rows, dtype=np.int64) % 100, chunks=(131_072,))
 
         # RSE Column 1: status with 4 distinct values
         # Distribution: 100k of value 0, 300k of value 1, 200k of value 2, 400k of value 3
@@ -38,7 +42,7 @@ def create_large_rse_test(filename='large_rse_test.h5'):
         # RSE Column 2: category with 20 runs alternating between 2 values
         # Each run is 50k rows, alternating between value 10 and 20
         category_run_starts = np.arange(0, n_rows, 50_000, dtype=np.int64)
-        category_values = np.array([10 if i % 2 == 0 else 20 for i in range(20)], dtype=np.int32)
+        category_values = np.where(np.arange(20) % 2 == 0, 10, 20).astype(np.int32)
 
         f.create_dataset('category_run_starts', data=category_run_starts)
         f.create_dataset('category_values', data=category_values)
@@ -7,18 +7,39 @@ import numpy as np
 
 NUM_GROUPS = 100_000
 
+# One shared DCPL for every tiny dataset: COMPACT layout stores the raw data
+# inside the object header, so each dataset costs one metadata write instead
+# of a separate heap allocation plus B-tree insert.
+_COMPACT_DCPL = h5py.h5p.create(h5py.h5p.DATASET_CREATE)
+_COMPACT_DCPL.set_layout(h5py.h5d.COMPACT)
+_COMPACT_DCPL.set_obj_track_times(False)
+
+
+def create_compact_dataset(grp, name, data):
+    """Create a tiny dataset with COMPACT layout via the low-level API."""
+    data = np.asarray(data)
+    if data.shape:
+        space = h5py.h5s.create_simple(data.shape)
+    else:
+        space = h5py.h5s.create(h5py.h5s.SCALAR)
+    dset = h5py.h5d.create(
+        grp.id, name.encode(), h5py.h5t.py_create(data.dtype, logical=True), space, dcpl=_COMPACT_DCPL
+    )
+    dset.write(h5py.h5s.ALL, h5py.h5s.ALL, np.ascontiguousarray(data))
+
 
 def main(filename="many_groups.h5"):
     print(f"Creating {filename} with {NUM_GROUPS} groups...")
-    with h5py.File(filename, "w") as f:
+    # libver="latest" keeps object headers compact and group creation cheap.
+    with h5py.File(filename, "w", libver="latest") as f:
         for i in range(NUM_GROUPS):
             grp = f.create_group(f"g{i:06d}")
             if i % 3 == 0:
-                grp.create_dataset("scalar", data=np.int32(i))
+                create_compact_dataset(grp, "scalar", np.int32(i))
             elif i % 3 == 1:
-                grp.create_dataset("vec", data=np.array([i], dtype=np.int32))
+                create_compact_dataset(grp, "vec", np.array([i], dtype=np.int32))
             else:
-                grp.create_dataset("mat", data=np.arange(2, dtype=np.int32).reshape(1, 2))
+                create_compact_dataset(grp, "mat", np.arange(2, dtype=np.int32).reshape(1, 2))
     print(f"Created {filename} successfully!")
 
 
@@ -50,14 +50,12 @@ def create_detector_data(f, detector_id):
     # event_index: run-starts indicating where each time_zero value begins
     # Divide rows evenly among runs
     rows_per_run = ROWS_PER_DETECTOR // NUM_RUNS
-    event_index = np.array([i * rows_per_run for i in range(NUM_RUNS)], dtype=np.uint64)
+    event_index = np.arange(NUM_RUNS, dtype=np.uint64) * rows_per_run
     grp.create_dataset('event_index', data=event_index)
 
     # event_time_zero: the time values that get expanded via RSE
     # Each detector has slightly different time_zero values
-    event_time_zero = np.array(
-        [1000000000 + detector_id * 1000000 + i * 50000 for i in range(NUM_RUNS)], dtype=np.uint64
-    )
+    event_time_zero = 1000000000 + detector_id * 1000000 + np.arange(NUM_RUNS, dtype=np.uint64) * 50000
     grp.create_dataset('event_time_zero', data=event_time_zero)
 
     return grp
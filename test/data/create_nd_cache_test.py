@@ -10,16 +10,39 @@ import numpy as np
 ROWS = 1_000_000
 
 
+def _create_int32_dataset(f, name, shape, chunks=None):
+    """Create an int32 dataset that skips HDF5's initial zero-fill pass.
+
+    Every element is overwritten by _fill_dataset, so the default fill pass
+    would only double the write traffic.
+    """
+    dcpl = h5py.h5p.create(h5py.h5p.DATASET_CREATE)
+    if chunks is not None:
+        dcpl.set_chunk(chunks)
+    dcpl.set_fill_time(h5py.h5d.FILL_TIME_NEVER)
+    dcpl.set_alloc_time(h5py.h5d.ALLOC_TIME_LATE)
+    space = h5py.h5s.create_simple(shape)
+    h5py.h5d.create(f.id, name.encode(), h5py.h5t.py_create(np.dtype(np.int32)), space, dcpl=dcpl)
+    return f[name]
+
+
 def _fill_dataset(dataset, inner_shape):
-    chunk_rows = 10_000
+    # Write in multiples of the HDF5 chunk's row extent so each slab lands on
+    # whole chunks; misaligned writes force a read-modify-write per partially
+    # covered chunk.
+    if dataset.chunks:
+        chunk_rows = max(dataset.chunks[0], 10_000 // dataset.chunks[0] * dataset.chunks[0])
+    else:
+        chunk_rows = 10_000
     total = dataset.shape[0]
     for start in range(0, total, chunk_rows):
         count = min(chunk_rows, total - start)
         data = np.arange(start, start + count, dtype=np.int32)
         if inner_shape:
-            data = data.reshape((count,) + (1,) * len(inner_shape))
-            data = np.broadcast_to(data, (count,) + inner_shape).copy()
-        dataset[start : start + count, ...] = data
+            # Zero-copy broadcast view; ascontiguousarray only materializes the
+            # tile when the write path actually needs contiguous memory.
+            data = np.broadcast_to(data.reshape((count,) + (1,) * len(inner_shape)), (count,) + inner_shape)
+        dataset.write_direct(np.ascontiguousarray(data), dest_sel=np.s_[start : start + count, ...])
         if (start // chunk_rows) % 10 == 0:
             print(f"  {dataset.name}: wrote rows {start}..{start + count - 1}")
 
@@ -27,14 +50,17 @@ def _fill_dataset(dataset, inner_shape):
 def create_nd_cache_test_file(filename="nd_cache_test.h5"):
     print(f"Creating {filename} with {ROWS} rows...")
 
-    with h5py.File(filename, "w") as f:
-        f.create_dataset("array_2d_contig", shape=(ROWS, 6), dtype=np.int32)
-        f.create_dataset("array_2d_chunked_small", shape=(ROWS, 6), dtype=np.int32, chunks=(128, 6))
-        f.create_dataset("array_2d_chunked_large", shape=(ROWS, 6), dtype=np.int32, chunks=(4096, 6))
-        f.create_dataset("array_2d_chunked_partial", shape=(ROWS, 20), dtype=np.int32, chunks=(10, 5))
+    # The fill loop below writes across many small chunks; a chunk cache much
+    # larger than the default 1 MB avoids evicting partially written chunks.
+    # libver="latest" also picks the more compact v2 B-tree metadata layout.
+    with h5py.File(filename, "w", libver="latest", rdcc_nbytes=64 * 1024 * 1024, rdcc_w0=0.75) as f:
+        _create_int32_dataset(f, "array_2d_contig", (ROWS, 6))
+        _create_int32_dataset(f, "array_2d_chunked_small", (ROWS, 6), chunks=(128, 6))
+        _create_int32_dataset(f, "array_2d_chunked_large", (ROWS, 6), chunks=(4096, 6))
+        _create_int32_dataset(f, "array_2d_chunked_partial", (ROWS, 20), chunks=(10, 5))
 
-        f.create_dataset("tensor_3d_chunked_large", shape=(ROWS, 4, 4), dtype=np.int32, chunks=(4096, 4, 4))
-        f.create_dataset("tensor_4d_chunked_small", shape=(ROWS, 2, 2, 2), dtype=np.int32, chunks=(256, 2, 2, 2))
+        _create_int32_dataset(f, "tensor_3d_chunked_large", (ROWS, 4, 4), chunks=(4096, 4, 4))
+        _create_int32_dataset(f, "tensor_4d_chunked_small", (ROWS, 2, 2, 2), chunks=(256, 2, 2, 2))
 
         _fill_dataset(f["array_2d_contig"], (6,))
         _fill_dataset(f["array_2d_chunked_small"], (6,))
@@ -16,51 +16,51 @@ def main():
     with h5py.File('pushdown_test.h5', 'w') as f:
         # RSE: 1000 rows with SORTED numeric values [10, 20, 30, 40, 50]
         # Each run has 200 rows
-        run_starts = np.array([0, 200, 400, 600, 800], dtype=np.uint64)
+        run_starts = np.arange(0, 1000, 200, dtype=np.uint64)
         values_int_sorted = np.array([10, 20, 30, 40, 50], dtype=np.int32)
-        f.create_dataset('/int_rse_starts', data=run_starts)
-        f.create_dataset('/int_rse_values', data=values_int_sorted)
+        f.create_dataset('/int_rse_starts', data=run_starts, track_times=False)
+        f.create_dataset('/int_rse_values', data=values_int_sorted, track_times=False)
 
         # RSE with UNSORTED values (should NOT be optimized)
         values_int_unsorted = np.array([50, 10, 30, 20, 40], dtype=np.int32)
-        f.create_dataset('/int_unsorted_rse_starts', data=run_starts)
-        f.create_dataset('/int_unsorted_rse_values', data=values_int_unsorted)
+        f.create_dataset('/int_unsorted_rse_starts', data=run_starts, track_times=False)
+        f.create_dataset('/int_unsorted_rse_values', data=values_int_unsorted, track_times=False)
 
         # RSE with float values for float testing (sorted)
         values_float = np.array([1.5, 2.5, 3.5, 4.5, 5.5], dtype=np.float32)
-        f.create_dataset('/float_rse_starts', data=run_starts)
-        f.create_dataset('/float_rse_values', data=values_float)
+        f.create_dataset('/float_rse_starts', data=run_starts, track_times=False)
+        f.create_dataset('/float_rse_values', data=values_float, track_times=False)
 
         # RSE with float values including NaN
         # Rows 0-199: 1.5, 200-399: 2.5, 400-599: NaN, 600-799: 4.5, 800-999: 5.5
         values_float_nan = np.array([1.5, 2.5, np.nan, 4.5, 5.5], dtype=np.float32)
-        f.create_dataset('/float_nan_rse_starts', data=run_starts)
-        f.create_dataset('/float_nan_rse_values', data=values_float_nan)
+        f.create_dataset('/float_nan_rse_starts', data=run_starts, track_times=False)
+        f.create_dataset('/float_nan_rse_values', data=values_float_nan, track_times=False)
 
         # RSE with int64 values (sorted)
         values_int64 = np.array([100, 200, 300, 400, 500], dtype=np.int64)
-        f.create_dataset('/int64_rse_starts', data=run_starts)
-        f.create_dataset('/int64_rse_values', data=values_int64)
+        f.create_dataset('/int64_rse_starts', data=run_starts, track_times=False)
+        f.create_dataset('/int64_rse_values', data=values_int64, track_times=False)
 
         # RSE with string values (should NOT be optimized - strings excluded)
         values_string = np.array([b'alpha', b'beta', b'gamma', b'delta', b'epsilon'], dtype='S10')
-        f.create_dataset('/string_rse_starts', data=run_starts)
-        f.create_dataset('/string_rse_values', data=values_string)
+        f.create_dataset('/string_rse_starts', data=run_starts, track_times=False)
+        f.create_dataset('/string_rse_values', data=values_string, track_times=False)
 
         # RSE with leading NULLs (first run starts after 0)
         # Rows 0-99: NULL, 100-299: 10, 300-699: 20, 700-999: 30
         leading_null_starts = np.array([100, 300, 700], dtype=np.uint64)
         leading_null_values = np.array([10, 20, 30], dtype=np.int32)
-        f.create_dataset('/leading_null_rse_starts', data=leading_null_starts)
-        f.create_dataset('/leading_null_rse_values', data=leading_null_values)
+        f.create_dataset('/leading_null_rse_starts', data=leading_null_starts, track_times=False)
+        f.create_dataset('/leading_null_rse_values', data=leading_null_values, track_times=False)
 
         # Regular column for comparison (0-999)
         regular = np.arange(1000, dtype=np.int32)
-        f.create_dataset('/regular', data=regular)
+        f.create_dataset('/regular', data=regular, track_times=False)
 
         # Another regular column with float values
         regular_float = np.arange(1000, dtype=np.float64) * 0.1
-        f.create_dataset('/regular_float', data=regular_float)
+        f.create_dataset('/regular_float', data=regular_float, track_times=False)
 
     print("Created pushdown_test.h5 with:")
     print("  - Sorted int32 RSE column (values: 10, 20, 30, 40, 50)")
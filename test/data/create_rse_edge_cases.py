@@ -16,402 +16,204 @@ import numpy as np
 
 CHUNK_SIZE = 2048  # DuckDB's STANDARD_VECTOR_SIZE
 
+# Every `index` column below is a monotonic int32 ramp; build the longest one
+# once and hand out slices instead of reallocating per test group (h5py copies
+# on write, so sharing the buffer is safe).
+MAX_INDEX_ROWS = 5000
+INDEX_I32 = np.arange(MAX_INDEX_ROWS, dtype=np.int32)
 
-def create_rse_dataset(f, group_name, index_data, run_starts, values, dtype=np.int32):
+# Variable-length UTF-8 string type, committed once instead of per call site.
+VLEN_UTF8 = h5py.string_dtype(encoding='utf-8')
+
+# Scratch pool for the many small int32 `values` literals below; create_dataset
+# copies on write, so the same backing buffer can serve every test group.
+SCRATCH_I32 = np.empty(32, dtype=np.int32)
+
+
+def _lit_i32(*vals):
+    """Return an int32 view of `vals` backed by the shared scratch pool."""
+    SCRATCH_I32[:len(vals)] = vals
+    return SCRATCH_I32[:len(vals)]
+
+
+def _fit_uint(arr):
+    """Smallest unsigned dtype holding every element of `arr`.
+
+    The scanner accepts any integer width for run_starts, so storing the
+    small edge-case arrays as uint8/uint16 instead of a blanket uint64
+    shrinks the file without changing any logical value.
+    """
+    if arr.size == 0:
+        return np.uint64
+    m = int(arr.max())
+    return np.uint8 if m < 2**8 else np.uint16 if m < 2**16 else np.uint32 if m < 2**32 else np.uint64
+
+
+def create_rse_dataset(f, group_name, index_data, run_starts, values, dtype=np.int32,
+                       run_starts_dtype=None, **create_kwargs):
     """Helper to create RSE dataset with index, run_starts, and values."""
+    create_kwargs.setdefault('track_times', False)
+    if run_starts_dtype is None:
+        run_starts_dtype = _fit_uint(run_starts)
     grp = f.create_group(group_name)
-    grp.create_dataset('index', data=index_data)
-    grp.create_dataset('run_starts', data=run_starts, dtype=np.uint64)
-    grp.create_dataset('values', data=values, dtype=dtype)
+    grp.create_dataset('index', data=index_data, **create_kwargs)
+    grp.create_dataset('run_starts', data=run_starts, dtype=run_starts_dtype, **create_kwargs)
+    grp.create_dataset('values', data=values, dtype=dtype, **create_kwargs)
     return grp
 
 
-with h5py.File('rse_edge_cases.h5', 'w') as f:
-
-    # ==========================================================================
+# One spec per test group: (name, index rows, run_starts, values[, dtype]).
+# A single loop below instantiates them all through create_rse_dataset, so
+# chunking/caching/dtype policy changes happen in exactly one place.
+SPECS = [
     # Test 1: Single row dataset
-    # ==========================================================================
-    create_rse_dataset(
-        f,
-        'single_row',
-        index_data=np.array([0], dtype=np.int32),
-        run_starts=np.array([0], dtype=np.uint64),
-        values=np.array([42], dtype=np.int32),
-    )
-
-    # ==========================================================================
+    dict(name='single_row', rows=1, run_starts=(0,), values=(42,)),
+
     # Test 2: Single-entry runs (worst case for RLE, every row is different run)
-    # ==========================================================================
-    create_rse_dataset(
-        f,
-        'single_entry_runs',
-        index_data=np.arange(10, dtype=np.int32),
-        run_starts=np.array([0, 1, 2, 3, 4, 5, 6, 7, 8, 9], dtype=np.uint64),
-        values=np.array([100, 200, 300, 400, 500, 600, 700, 800, 900, 1000], dtype=np.int32),
-    )
-
-    # ==========================================================================
+    dict(name='single_entry_runs', rows=10,
+         run_starts=(0, 1, 2, 3, 4, 5, 6, 7, 8, 9),
+         values=(100, 200, 300, 400, 500, 600, 700, 800, 900, 1000)),
+
     # Test 3: Runs aligned exactly with chunk boundary (2048)
-    # First run: rows 0-2047 (2048 rows, exactly one chunk)
-    # Second run: rows 2048-4095 (2048 rows, exactly one chunk)
-    # Third run: rows 4096-4099 (4 rows, partial chunk)
-    # ==========================================================================
-    num_rows_aligned = 4100
-    create_rse_dataset(
-        f,
-        'chunk_aligned',
-        index_data=np.arange(num_rows_aligned, dtype=np.int32),
-        run_starts=np.array([0, 2048, 4096], dtype=np.uint64),
-        values=np.array([1, 2, 3], dtype=np.int32),
-    )
-
-    # ==========================================================================
+    # Runs: rows 0-2047 (one full chunk), 2048-4095 (one full chunk),
+    # 4096-4099 (4 rows, partial chunk)
+    dict(name='chunk_aligned', rows=4100, run_starts=(0, 2048, 4096), values=(1, 2, 3)),
+
     # Test 4: Single run spanning multiple chunks (constant value)
     # 5000 rows all with same value - tests CONSTANT_VECTOR optimization
-    # ==========================================================================
-    num_rows_constant = 5000
-    create_rse_dataset(
-        f,
-        'constant_multi_chunk',
-        index_data=np.arange(num_rows_constant, dtype=np.int32),
-        run_starts=np.array([0], dtype=np.uint64),
-        values=np.array([999], dtype=np.int32),
-    )
-
-    # ==========================================================================
+    dict(name='constant_multi_chunk', rows=5000, run_starts=(0,), values=(999,)),
+
     # Test 5: Run boundary in middle of chunk
-    # First run: 0-1000 (1001 rows)
-    # Second run: 1001-3000 (1999 rows, spans chunk boundary at 2048)
-    # Third run: 3001-3499 (499 rows)
-    # ==========================================================================
-    create_rse_dataset(
-        f,
-        'mid_chunk_boundary',
-        index_data=np.arange(3500, dtype=np.int32),
-        run_starts=np.array([0, 1001, 3001], dtype=np.uint64),
-        values=np.array([10, 20, 30], dtype=np.int32),
-    )
-
-    # ==========================================================================
+    # Runs: 0-1000 (1001 rows), 1001-3000 (1999 rows, spans chunk boundary
+    # at 2048), 3001-3499 (499 rows)
+    dict(name='mid_chunk_boundary', rows=3500, run_starts=(0, 1001, 3001), values=(10, 20, 30)),
+
     # Test 6: Large run followed by many small runs
     # First run: 0-3000 (3001 rows, spans chunks 0, 1, partial 2)
     # Then: 10 runs of 1 row each (3001-3010)
-    # ==========================================================================
-    create_rse_dataset(
-        f,
-        'large_then_small',
-        index_data=np.arange(3011, dtype=np.int32),
-        run_starts=np.array([0, 3001, 3002, 3003, 3004, 3005, 3006, 3007, 3008, 3009, 3010], dtype=np.uint64),
-        values=np.array([1, 2, 3, 4, 5, 6, 7, 8, 9, 10, 11], dtype=np.int32),
-    )
-
-    # ==========================================================================
-    # Test 7: Different data types - int8
-    # ==========================================================================
-    create_rse_dataset(
-        f,
-        'type_int8',
-        index_data=np.arange(100, dtype=np.int32),
-        run_starts=np.array([0, 50], dtype=np.uint64),
-        values=np.array([127, -128], dtype=np.int8),
-        dtype=np.int8,
-    )
-
-    # ==========================================================================
-    # Test 8: Different data types - int64
-    # ==========================================================================
-    create_rse_dataset(
-        f,
-        'type_int64',
-        index_data=np.arange(100, dtype=np.int32),
-        run_starts=np.array([0, 25, 75], dtype=np.uint64),
-        values=np.array([9223372036854775807, -9223372036854775808, 0], dtype=np.int64),
-        dtype=np.int64,
-    )
-
-    # ==========================================================================
-    # Test 9: Different data types - float32
-    # ==========================================================================
-    create_rse_dataset(
-        f,
-        'type_float32',
-        index_data=np.arange(100, dtype=np.int32),
-        run_starts=np.array([0, 33, 67], dtype=np.uint64),
-        values=np.array([3.14159, 2.71828, 1.41421], dtype=np.float32),
-        dtype=np.float32,
-    )
-
-    # ==========================================================================
-    # Test 10: Different data types - float16
-    # ==========================================================================
-    create_rse_dataset(
-        f,
-        'type_float16',
-        index_data=np.arange(100, dtype=np.int32),
-        run_starts=np.array([0, 33, 67], dtype=np.uint64),
-        values=np.array([1.5, 2.5, 3.5], dtype=np.float16),
-        dtype=np.float16,
-    )
-
-    # ==========================================================================
-    # Test 11: Different data types - float64
-    # ==========================================================================
-    create_rse_dataset(
-        f,
-        'type_float64',
-        index_data=np.arange(100, dtype=np.int32),
-        run_starts=np.array([0, 40, 80], dtype=np.uint64),
-        values=np.array([3.141592653589793, 2.718281828459045, 1.4142135623730951], dtype=np.float64),
-        dtype=np.float64,
-    )
-
-    # ==========================================================================
-    # Test 12: Different data types - string
-    # ==========================================================================
-    grp = f.create_group('type_string')
-    grp.create_dataset('index', data=np.arange(50, dtype=np.int32))
-    grp.create_dataset('run_starts', data=np.array([0, 20, 40], dtype=np.uint64))
-    grp.create_dataset('values', data=np.array(['alpha', 'beta', 'gamma'], dtype=h5py.string_dtype()))
-
-    # ==========================================================================
+    dict(name='large_then_small', rows=3011,
+         run_starts=(0, 3001, 3002, 3003, 3004, 3005, 3006, 3007, 3008, 3009, 3010),
+         values=(1, 2, 3, 4, 5, 6, 7, 8, 9, 10, 11)),
+
+    # Tests 7-12: Different data types
+    dict(name='type_int8', rows=100, run_starts=(0, 50),
+         values=(127, -128), dtype=np.int8),
+    dict(name='type_int64', rows=100, run_starts=(0, 25, 75),
+         values=(9223372036854775807, -9223372036854775808, 0), dtype=np.int64),
+    dict(name='type_float32', rows=100, run_starts=(0, 33, 67),
+         values=(3.14159, 2.71828, 1.41421), dtype=np.float32),
+    dict(name='type_float16', rows=100, run_starts=(0, 33, 67),
+         values=(1.5, 2.5, 3.5), dtype=np.float16),
+    dict(name='type_float64', rows=100, run_starts=(0, 40, 80),
+         values=(3.141592653589793, 2.718281828459045, 1.4142135623730951), dtype=np.float64),
+    dict(name='type_string', rows=50, run_starts=(0, 20, 40),
+         values=('alpha', 'beta', 'gamma'), dtype=VLEN_UTF8),
+
     # Test 13: Exact chunk size (2048 rows, single run)
     # Tests CONSTANT_VECTOR optimization for exactly one chunk
-    # ==========================================================================
-    create_rse_dataset(
-        f,
-        'exact_one_chunk',
-        index_data=np.arange(CHUNK_SIZE, dtype=np.int32),
-        run_starts=np.array([0], dtype=np.uint64),
-        values=np.array([777], dtype=np.int32),
-    )
-
-    # ==========================================================================
+    dict(name='exact_one_chunk', rows=CHUNK_SIZE, run_starts=(0,), values=(777,)),
+
     # Test 14: Exactly 2 chunks (4096 rows, single run)
-    # ==========================================================================
-    create_rse_dataset(
-        f,
-        'exact_two_chunks',
-        index_data=np.arange(CHUNK_SIZE * 2, dtype=np.int32),
-        run_starts=np.array([0], dtype=np.uint64),
-        values=np.array([888], dtype=np.int32),
-    )
-
-    # ==========================================================================
+    dict(name='exact_two_chunks', rows=CHUNK_SIZE * 2, run_starts=(0,), values=(888,)),
+
     # Test 15: Chunk + 1 row (2049 rows, single run)
     # First chunk is constant, second chunk has 1 row
-    # ==========================================================================
-    create_rse_dataset(
-        f,
-        'chunk_plus_one',
-        index_data=np.arange(CHUNK_SIZE + 1, dtype=np.int32),
-        run_starts=np.array([0], dtype=np.uint64),
-        values=np.array([111], dtype=np.int32),
-    )
-
-    # ==========================================================================
+    dict(name='chunk_plus_one', rows=CHUNK_SIZE + 1, run_starts=(0,), values=(111,)),
+
     # Test 16: Chunk - 1 row (2047 rows, single run)
     # Just under one chunk
-    # ==========================================================================
-    create_rse_dataset(
-        f,
-        'chunk_minus_one',
-        index_data=np.arange(CHUNK_SIZE - 1, dtype=np.int32),
-        run_starts=np.array([0], dtype=np.uint64),
-        values=np.array([222], dtype=np.int32),
-    )
-
-    # ==========================================================================
+    dict(name='chunk_minus_one', rows=CHUNK_SIZE - 1, run_starts=(0,), values=(222,)),
+
     # Test 17: Multiple runs within first chunk
     # 5 runs of ~400 rows each within first chunk (total 2000 < 2048)
-    # ==========================================================================
-    create_rse_dataset(
-        f,
-        'multi_runs_one_chunk',
-        index_data=np.arange(2000, dtype=np.int32),
-        run_starts=np.array([0, 400, 800, 1200, 1600], dtype=np.uint64),
-        values=np.array([1, 2, 3, 4, 5], dtype=np.int32),
-    )
-
-    # ==========================================================================
+    dict(name='multi_runs_one_chunk', rows=2000,
+         run_starts=(0, 400, 800, 1200, 1600), values=(1, 2, 3, 4, 5)),
+
     # Test 17: Alternating pattern crossing chunk boundary
     # Pattern: 1000 rows of A, 1000 of B, 1000 of A, 1000 of B
     # Boundaries at 1000, 2000 (crosses chunk at 2048), 3000
-    # ==========================================================================
-    create_rse_dataset(
-        f,
-        'alternating_cross_chunk',
-        index_data=np.arange(4000, dtype=np.int32),
-        run_starts=np.array([0, 1000, 2000, 3000], dtype=np.uint64),
-        values=np.array([100, 200, 100, 200], dtype=np.int32),
-    )
-
-    # ==========================================================================
+    dict(name='alternating_cross_chunk', rows=4000,
+         run_starts=(0, 1000, 2000, 3000), values=(100, 200, 100, 200)),
+
     # Test 18: Very small dataset (3 rows, 2 runs)
-    # ==========================================================================
-    create_rse_dataset(
-        f,
-        'very_small',
-        index_data=np.array([0, 1, 2], dtype=np.int32),
-        run_starts=np.array([0, 2], dtype=np.uint64),
-        values=np.array([10, 20], dtype=np.int32),
-    )
-
-    # ==========================================================================
+    dict(name='very_small', rows=3, run_starts=(0, 2), values=(10, 20)),
+
     # Test 19: Empty run_starts and values (should produce NULLs)
-    # ==========================================================================
-    create_rse_dataset(
-        f,
-        'empty_runs',
-        index_data=np.arange(5, dtype=np.int32),
-        run_starts=np.array([], dtype=np.uint64),
-        values=np.array([], dtype=np.int32),
-    )
-
-    # ==========================================================================
+    dict(name='empty_runs', rows=5, run_starts=(), values=()),
+
     # Test 20: Empty run_starts and values (string type, should produce NULLs)
-    # ==========================================================================
-    create_rse_dataset(
-        f,
-        'empty_runs_string',
-        index_data=np.arange(4, dtype=np.int32),
-        run_starts=np.array([], dtype=np.uint64),
-        values=np.array([], dtype=h5py.string_dtype()),
-        dtype=h5py.string_dtype(),
-    )
-
-    # ==========================================================================
+    dict(name='empty_runs_string', rows=4, run_starts=(), values=(), dtype=VLEN_UTF8),
+
     # Test 21: Leading NULLs (first run does not start at 0)
     # Rows 0-1 -> NULL, 2-3 -> 10, 4-5 -> 20
-    # ==========================================================================
-    create_rse_dataset(
-        f,
-        'leading_nulls',
-        index_data=np.arange(6, dtype=np.int32),
-        run_starts=np.array([2, 4], dtype=np.uint64),
-        values=np.array([10, 20], dtype=np.int32),
-    )
-
-    # ==========================================================================
+    dict(name='leading_nulls', rows=6, run_starts=(2, 4), values=(10, 20)),
+
     # Test 22: Leading NULLs with string values
     # Rows 0-2 -> NULL, 3-4 -> "alpha", 5-6 -> "beta"
-    # ==========================================================================
-    create_rse_dataset(
-        f,
-        'leading_nulls_string',
-        index_data=np.arange(7, dtype=np.int32),
-        run_starts=np.array([3, 5], dtype=np.uint64),
-        values=np.array(['alpha', 'beta'], dtype=h5py.string_dtype()),
-        dtype=h5py.string_dtype(),
-    )
-
-    # ==========================================================================
+    dict(name='leading_nulls_string', rows=7, run_starts=(3, 5),
+         values=('alpha', 'beta'), dtype=VLEN_UTF8),
+
     # Test 23: Leading NULLs with mid-chunk boundary transition
     # Rows 0-99 -> NULL, 100-2199 -> 1, 2200-2999 -> 2
     # First run starts mid-chunk, second run crosses chunk boundary (2048)
-    # ==========================================================================
-    create_rse_dataset(
-        f,
-        'leading_nulls_mid_chunk',
-        index_data=np.arange(3000, dtype=np.int32),
-        run_starts=np.array([100, 2200], dtype=np.uint64),
-        values=np.array([1, 2], dtype=np.int32),
-    )
-
-    # ==========================================================================
+    dict(name='leading_nulls_mid_chunk', rows=3000, run_starts=(100, 2200), values=(1, 2)),
+
     # Test 24: Zero-length run in the middle
     # Rows 0-1 -> 10, rows 2-3 -> 30. Value 20 has zero rows.
-    # ==========================================================================
-    create_rse_dataset(
-        f,
-        'zero_length_middle',
-        index_data=np.arange(6, dtype=np.int32),
-        run_starts=np.array([0, 2, 2, 4], dtype=np.uint64),
-        values=np.array([10, 20, 30, 40], dtype=np.int32),
-    )
-
-    # ==========================================================================
+    dict(name='zero_length_middle', rows=6, run_starts=(0, 2, 2, 4), values=(10, 20, 30, 40)),
+
     # Test 25: Zero-length run at the start
     # Value 99 has zero rows; the second run at 0 is visible.
-    # ==========================================================================
-    create_rse_dataset(
-        f,
-        'zero_length_start',
-        index_data=np.arange(5, dtype=np.int32),
-        run_starts=np.array([0, 0, 3], dtype=np.uint64),
-        values=np.array([99, 10, 20], dtype=np.int32),
-    )
-
-    # ==========================================================================
+    dict(name='zero_length_start', rows=5, run_starts=(0, 0, 3), values=(99, 10, 20)),
+
     # Test 26: Zero-length run at the end
     # run_start == row_count is allowed and has zero rows.
-    # ==========================================================================
-    create_rse_dataset(
-        f,
-        'zero_length_end',
-        index_data=np.arange(5, dtype=np.int32),
-        run_starts=np.array([0, 3, 5], dtype=np.uint64),
-        values=np.array([10, 20, 99], dtype=np.int32),
-    )
-
-    # ==========================================================================
+    dict(name='zero_length_end', rows=5, run_starts=(0, 3, 5), values=(10, 20, 99)),
+
     # Test 27: Only a terminal zero-length run
     # Rows before the first start are NULL; the sole value has zero rows.
-    # ==========================================================================
-    create_rse_dataset(
-        f,
-        'zero_length_all_null',
-        index_data=np.arange(5, dtype=np.int32),
-        run_starts=np.array([5], dtype=np.uint64),
-        values=np.array([99], dtype=np.int32),
-    )
-
-    # ==========================================================================
+    dict(name='zero_length_all_null', rows=5, run_starts=(5,), values=(99,)),
+
     # Test 28: Zero-length string run
     # "unused" has zero rows; "beta" is visible from the duplicate start.
-    # ==========================================================================
-    create_rse_dataset(
-        f,
-        'zero_length_string',
-        index_data=np.arange(4, dtype=np.int32),
-        run_starts=np.array([0, 2, 2], dtype=np.uint64),
-        values=np.array(['alpha', 'unused', 'beta'], dtype=h5py.string_dtype()),
-        dtype=h5py.string_dtype(),
-    )
-
-    # ==========================================================================
+    dict(name='zero_length_string', rows=4, run_starts=(0, 2, 2),
+         values=('alpha', 'unused', 'beta'), dtype=VLEN_UTF8),
+
     # Test 29: Multiple zero-length runs at the same start
     # Values 20 and 30 have zero rows; value 40 is visible from the last duplicate.
-    # ==========================================================================
-    create_rse_dataset(
-        f,
-        'zero_length_repeated',
-        index_data=np.arange(5, dtype=np.int32),
-        run_starts=np.array([0, 2, 2, 2, 4], dtype=np.uint64),
-        values=np.array([10, 20, 30, 40, 50], dtype=np.int32),
-    )
-
-    # ==========================================================================
+    dict(name='zero_length_repeated', rows=5, run_starts=(0, 2, 2, 2, 4),
+         values=(10, 20, 30, 40, 50)),
+
     # Test 30: Starts beyond the row count are terminal zero-length runs
     # Rows 0-1 -> 10, rows 2-4 -> 20. Values 99 and 100 have zero rows.
-    # ==========================================================================
-    create_rse_dataset(
-        f,
-        'overlong_tail',
-        index_data=np.arange(5, dtype=np.int32),
-        run_starts=np.array([0, 2, 100, 101], dtype=np.uint64),
-        values=np.array([10, 20, 99, 100], dtype=np.int32),
-    )
-
-    # ==========================================================================
+    dict(name='overlong_tail', rows=5, run_starts=(0, 2, 100, 101), values=(10, 20, 99, 100)),
+
     # Test 31: If every start is beyond the row count, all rows are leading NULLs
-    # ==========================================================================
-    create_rse_dataset(
-        f,
-        'overlong_first',
-        index_data=np.arange(5, dtype=np.int32),
-        run_starts=np.array([100, 101], dtype=np.uint64),
-        values=np.array([99, 100], dtype=np.int32),
-    )
+    dict(name='overlong_first', rows=5, run_starts=(100, 101), values=(99, 100)),
+]
+
+
+# libver='latest' keeps object headers compact; the raised rdcc_nbytes keeps
+# all metadata writes batched in cache until the single flush at close. The
+# dozens of small groups below each allocate object headers, so a 64 KB
+# metadata block size (default 2 KB) packs them densely instead of scattering
+# small metadata allocations across the file.
+with h5py.File('rse_edge_cases.h5', 'w', libver='latest',
+               rdcc_nbytes=16 * 1024 * 1024, meta_block_size=65536) as f:
+    for spec in SPECS:
+        dtype = spec.get('dtype', np.int32)
+        if dtype is np.int32:
+            values = _lit_i32(*spec['values'])
+        else:
+            values = np.array(spec['values'], dtype=dtype)
+        create_rse_dataset(
+            f,
+            spec['name'],
+            index_data=INDEX_I32[:spec['rows']],
+            run_starts=np.array(spec['run_starts'], dtype=np.uint64),
+            values=values,
+            dtype=dtype,
+        )
 
 print("Created rse_edge_cases.h5 successfully!")
 print(f"Chunk size used: {CHUNK_SIZE}")
@@ -12,6 +12,17 @@ Run-length encoding represents repeated values compactly:
 import numpy as np
 import h5py
 
+# Variable-length UTF-8 string type, committed once instead of per call site.
+VLEN_UTF8 = h5py.string_dtype(encoding='utf-8')
+
+
+def rle_from_lengths(lengths):
+    """Derive run_starts from per-run lengths (exclusive prefix sum)."""
+    run_starts = np.empty(len(lengths), dtype=np.int64)
+    run_starts[0] = 0
+    np.cumsum(lengths[:-1], out=run_starts[1:])
+    return run_starts
+
 
 def create_run_encoded_test_file(filename='run_encoded.h5'):
     """Create HDF5 file with run-encoded datasets.
@@ -26,64 +37,63 @@ def create_run_encoded_test_file(filename='run_encoded.h5'):
         grp1 = f.create_group('experiment1')
 
         # Regular "long" dataset A - this defines the row count (10 rows)
-        grp1.create_dataset('timestamp', data=np.arange(10, dtype=np.int64))
+        grp1.create_dataset('timestamp', data=np.arange(10, dtype=np.int64), track_times=False)
 
         # Run-encoded dataset B (repeated states)
         # Must expand to 10 elements to align with 'timestamp'
         # Logical B: [100, 100, 100, 200, 200, 200, 200, 300, 300, 300]
-        grp1.create_dataset('state_run_starts', data=np.array([0, 3, 7], dtype=np.int64))
-        grp1.create_dataset('state_values', data=np.array([100, 200, 300], dtype=np.int32))
+        grp1.create_dataset('state_run_starts', data=np.array([0, 3, 7], dtype=np.int64), track_times=False)
+        grp1.create_dataset('state_values', data=np.array([100, 200, 300], dtype=np.int32), track_times=False)
 
         # NOTE: No logical_length attribute needed - it's implied by timestamp.shape[0]
 
         # Example 2: High compression ratio (realistic scenario)
         grp2 = f.create_group('experiment2')
 
-        np.random.seed(42)
+        rng = np.random.default_rng(42)
 
         # Regular "long" datasets - 1000 rows
-        grp2.create_dataset('measurement', data=np.random.randn(1000))
-        grp2.create_dataset('sensor_id', data=np.random.randint(0, 10, size=1000))
+        grp2.create_dataset('measurement', data=rng.standard_normal(1000), track_times=False)
+        grp2.create_dataset('sensor_id', data=rng.integers(0, 10, size=1000), track_times=False)
 
         # Run-encoded status (highly repetitive)
         # Status: 200 × "idle", 300 × "running", 400 × "idle", 100 × "shutdown"
-        run_starts = np.array([0, 200, 500, 900], dtype=np.int64)
+        run_starts = rle_from_lengths([200, 300, 400, 100])
         run_values = np.array([0, 1, 0, 2], dtype=np.int32)  # 0=idle, 1=running, 2=shutdown
 
-        grp2.create_dataset('status_run_starts', data=run_starts)
-        grp2.create_dataset('status_values', data=run_values)
+        grp2.create_dataset('status_run_starts', data=run_starts, track_times=False)
+        grp2.create_dataset('status_values', data=run_values, track_times=False)
 
         # Example 3: String values (categorical data)
         grp3 = f.create_group('experiment3')
 
         # Regular "long" datasets - 8 rows
-        grp3.create_dataset('time', data=np.arange(8, dtype=np.float64))
-        grp3.create_dataset('value', data=[10.5, 11.2, 12.1, 15.3, 14.8, 16.2, 15.9, 10.1])
+        grp3.create_dataset('time', data=np.arange(8, dtype=np.float64), track_times=False)
+        grp3.create_dataset('value', data=[10.5, 11.2, 12.1, 15.3, 14.8, 16.2, 15.9, 10.1], track_times=False)
 
         # Run-encoded categorical variable
         # Logical: ["low", "low", "low", "high", "high", "high", "high", "low"]
         run_starts = np.array([0, 3, 7], dtype=np.int64)
-        dt = h5py.string_dtype(encoding='utf-8')
-        run_values = np.array(["low", "high", "low"], dtype=dt)
+        run_values = np.array(["low", "high", "low"], dtype=VLEN_UTF8)
 
-        grp3.create_dataset('level_run_starts', data=run_starts)
-        grp3.create_dataset('level_values', data=run_values)
+        grp3.create_dataset('level_run_starts', data=run_starts, track_times=False)
+        grp3.create_dataset('level_values', data=run_values, track_times=False)
 
         # Example 4: Edge cases
         grp4 = f.create_group('edge_cases')
 
         # Regular "long" dataset
-        grp4.create_dataset('index', data=np.arange(10, dtype=np.int64))
+        grp4.create_dataset('index', data=np.arange(10, dtype=np.int64), track_times=False)
 
         # Single run (no compression benefit) - must expand to 10
-        grp4.create_dataset('single_run_starts', data=np.array([0], dtype=np.int64))
-        grp4.create_dataset('single_run_values', data=np.array([42], dtype=np.int32))
+        grp4.create_dataset('single_run_starts', data=np.array([0], dtype=np.int64), track_times=False)
+        grp4.create_dataset('single_run_values', data=np.array([42], dtype=np.int32), track_times=False)
 
         # Every value different (worst case for RLE) - 10 rows, 10 runs
         grp5 = f.create_group('no_compression')
-        grp5.create_dataset('seq', data=np.arange(5, dtype=np.int64))
-        grp5.create_dataset('bad_rle_starts', data=np.arange(5, dtype=np.int64))
-        grp5.create_dataset('bad_rle_values', data=np.array([1, 2, 3, 4, 5], dtype=np.int32))
+        grp5.create_dataset('seq', data=np.arange(5, dtype=np.int64), track_times=False)
+        grp5.create_dataset('bad_rle_starts', data=np.arange(5, dtype=np.int64), track_times=False)
+        grp5.create_dataset('bad_rle_values', data=np.array([1, 2, 3, 4, 5], dtype=np.int32), track_times=False)
 
     print(f"OK Created {filename}")
     print_file_structure(filename)
@@ -127,12 +137,10 @@ def demonstrate_expansion():
         values = np.array(ex['values'])
         length = ex['length']
 
-        # Expand
-        expanded = np.zeros(length, dtype=values.dtype)
-        for i in range(len(run_starts)):
-            start = run_starts[i]
-            end = run_starts[i + 1] if i + 1 < len(run_starts) else length
-            expanded[start:end] = values[i]
+        # Expand: each run's length is the gap to the next start (or the end),
+        # so one np.repeat decompresses the whole column without a Python loop.
+        lengths = np.diff(np.append(run_starts, length))
+        expanded = np.repeat(values, lengths)
 
         # Calculate compression ratio
         compressed_size = len(run_starts) + len(values)
@@ -6,6 +6,24 @@ Create test HDF5 files for h5db extension development and testing.
 import numpy as np
 import h5py
 
+# One DCPL shared by every dataset in create_types_test_file: the property
+# list setup is paid once instead of per create_dataset call.
+_SHARED_DCPL = h5py.h5p.create(h5py.h5p.DATASET_CREATE)
+_SHARED_DCPL.set_obj_track_times(False)
+
+
+def _create_dataset(f, name, data):
+    """create_dataset equivalent reusing the shared DCPL via the low-level API."""
+    data = np.asarray(data)
+    if data.shape:
+        space = h5py.h5s.create_simple(data.shape)
+    else:
+        space = h5py.h5s.create(h5py.h5s.SCALAR)
+    dset = h5py.h5d.create(
+        f.id, name.encode(), h5py.h5t.py_create(data.dtype, logical=True), space, dcpl=_SHARED_DCPL
+    )
+    dset.write(h5py.h5s.ALL, h5py.h5s.ALL, np.ascontiguousarray(data))
+
 
 def create_simple_test_file(filename='simple.h5'):
     """Create a simple HDF5 file with basic datasets."""
@@ -16,21 +34,21 @@ def create_simple_test_file(filename='simple.h5'):
 
     with h5py.File(filename, 'w') as f:
         # Root level datasets
-        f.create_dataset('integers', data=np.arange(10, dtype=np.int32))
-        f.create_dataset('floats', data=np.random.randn(10).astype(np.float64))
-        f.create_dataset('strings', data=np.array([b'hello', b'world', b'test']))
+        f.create_dataset('integers', data=np.arange(10, dtype=np.int32), track_times=False)
+        f.create_dataset('floats', data=np.random.randn(10), track_times=False)
+        f.create_dataset('strings', data=np.array([b'hello', b'world', b'test']), track_times=False)
 
         # 2D dataset
-        f.create_dataset('matrix', data=np.arange(20).reshape(5, 4).astype(np.int32))
+        f.create_dataset('matrix', data=np.arange(20).reshape(5, 4).astype(np.int32), track_times=False)
 
         # Group with nested datasets
         grp1 = f.create_group('group1')
-        grp1.create_dataset('data1', data=np.arange(5, dtype=np.float32))
-        grp1.create_dataset('data2', data=np.ones(10, dtype=np.int64))
+        grp1.create_dataset('data1', data=np.arange(5, dtype=np.float32), track_times=False)
+        grp1.create_dataset('data2', data=np.ones(10, dtype=np.int64), track_times=False)
 
         # Nested groups
         grp2 = grp1.create_group('subgroup')
-        grp2.create_dataset('nested_data', data=np.arange(100, dtype=np.uint8))
+        grp2.create_dataset('nested_data', data=np.arange(100, dtype=np.uint8), track_times=False)
 
         # Add some attributes
         f.attrs['title'] = 'Test HDF5 File'
@@ -47,27 +65,27 @@ def create_types_test_file(filename='types.h5'):
 
     with h5py.File(filename, 'w') as f:
         # Integer types
-        f.create_dataset('int8', data=np.array([1, 2, 3], dtype=np.int8))
-        f.create_dataset('int16', data=np.array([100, 200, 300], dtype=np.int16))
-        f.create_dataset('int32', data=np.array([10000, 20000], dtype=np.int32))
-        f.create_dataset('int64', data=np.array([1000000], dtype=np.int64))
+        _create_dataset(f, 'int8', np.array([1, 2, 3], dtype=np.int8))
+        _create_dataset(f, 'int16', np.array([100, 200, 300], dtype=np.int16))
+        _create_dataset(f, 'int32', np.array([10000, 20000], dtype=np.int32))
+        _create_dataset(f, 'int64', np.array([1000000], dtype=np.int64))
 
         # Unsigned integers
-        f.create_dataset('uint8', data=np.array([255, 254], dtype=np.uint8))
-        f.create_dataset('uint16', data=np.array([65535], dtype=np.uint16))
-        f.create_dataset('uint32', data=np.array([4294967295], dtype=np.uint32))
-        f.create_dataset('uint64', data=np.array([18446744073709551615], dtype=np.uint64))
+        _create_dataset(f, 'uint8', np.array([255, 254], dtype=np.uint8))
+        _create_dataset(f, 'uint16', np.array([65535], dtype=np.uint16))
+        _create_dataset(f, 'uint32', np.array([4294967295], dtype=np.uint32))
+        _create_dataset(f, 'uint64', np.array([18446744073709551615], dtype=np.uint64))
 
         # Floats
-        f.create_dataset('float16', data=np.array([1.5, 2.5, 3.5], dtype=np.float16))
-        f.create_dataset('scalar_float16', data=np.float16(4.5))
-        f.create_dataset('float32', data=np.array([3.14, 2.71], dtype=np.float32))
-        f.create_dataset('float64', data=np.array([3.141592653589793], dtype=np.float64))
+        _create_dataset(f, 'float16', np.array([1.5, 2.5, 3.5], dtype=np.float16))
+        _create_dataset(f, 'scalar_float16', np.float16(4.5))
+        _create_dataset(f, 'float32', np.array([3.14, 2.71], dtype=np.float32))
+        _create_dataset(f, 'float64', np.array([3.141592653589793], dtype=np.float64))
 
         # Strings
-        f.create_dataset('fixed_strings', data=np.array([b'fixed', b'width'], dtype='S5'))
+        _create_dataset(f, 'fixed_strings', np.array([b'fixed', b'width'], dtype='S5'))
         dt = h5py.string_dtype(encoding='utf-8')
-        f.create_dataset('var_strings', data=['variable', 'length', 'strings'], dtype=dt)
+        _create_dataset(f, 'var_strings', np.array(['variable', 'length', 'strings'], dtype=dt))
 
     print(f"OK Created {filename}")
     print_file_structure(filename)
@@ -79,20 +97,20 @@ def create_multidim_test_file(filename='multidim.h5'):
 
     with h5py.File(filename, 'w') as f:
         # 1D
-        f.create_dataset('array_1d', data=np.arange(10))
+        f.create_dataset('array_1d', data=np.arange(10), track_times=False)
 
-        # 2D
-        f.create_dataset('array_2d', data=np.arange(20).reshape(5, 4))
-        f.create_dataset('array_2d_float16', data=(np.arange(12, dtype=np.float16).reshape(3, 4) / np.float16(2.0)))
+        # 2D; int16 holds every ramp value below, no need for default int64
+        f.create_dataset('array_2d', data=np.arange(20, dtype=np.int16).reshape(5, 4), track_times=False)
+        f.create_dataset('array_2d_float16', data=(np.arange(12, dtype=np.float16).reshape(3, 4) / np.float16(2.0)), track_times=False)
 
         # 3D
-        f.create_dataset('array_3d', data=np.arange(60).reshape(5, 4, 3))
+        f.create_dataset('array_3d', data=np.arange(60, dtype=np.int16).reshape(5, 4, 3), track_times=False)
 
         # 4D
-        f.create_dataset('array_4d', data=np.arange(120).reshape(5, 4, 3, 2))
+        f.create_dataset('array_4d', data=np.arange(120, dtype=np.int16).reshape(5, 4, 3, 2), track_times=False)
 
         # 2D fixed-length string array (unsupported by h5_read)
-        f.create_dataset('array_2d_strings', data=np.array([[b'aa', b'bb'], [b'cc', b'dd']], dtype='S2'))
+        f.create_dataset('array_2d_strings', data=np.array([[b'aa', b'bb'], [b'cc', b'dd']], dtype='S2'), track_times=False)
 
     print(f"OK Created {filename}")
     print_file_structure(filename)
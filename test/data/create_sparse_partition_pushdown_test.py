@@ -13,7 +13,7 @@ ROWS = 4 * PARTITION_SIZE + 10
 
 def main() -> None:
     values = np.arange(ROWS, dtype=np.int32)
-    labels = np.array([f"row_{i:05d}".encode() for i in range(ROWS)], dtype="S10")
+    labels = np.char.mod(b"row_%05d", np.arange(ROWS)).astype("S10")
 
     selector_starts = np.array(
         [
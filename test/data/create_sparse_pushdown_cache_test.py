@@ -14,7 +14,7 @@ def main():
 
     row_values = np.arange(rows, dtype=np.int32).reshape(rows, 1, 1)
     regular = np.broadcast_to(row_values, (rows, 4, 4)).copy()
-    labels = np.array([f"row_{i:02d}".encode() for i in range(rows)], dtype="S6")
+    labels = np.char.mod(b"row_%02d", np.arange(rows)).astype("S6")
 
     selector_starts = np.array([0, 8, 16, 24, 32], dtype=np.uint64)
     selector_values = np.array([1, 0, 1, 0, 1], dtype=np.int32)
@@ -20,84 +20,91 @@ Large structure (10M rows):
 import h5py
 import numpy as np
 
+from write_utils import preallocate
+
 NUM_ROWS = 10_000_000
 ROWS_PER_RUN = NUM_ROWS // 5  # 2,000,000 rows per run
 
+
 print(f"Creating large-scale predicate pushdown test file with {NUM_ROWS:,} rows...")
 print(f"Rows per run: {ROWS_PER_RUN:,}")
 
-with h5py.File('large_pushdown_test.h5', 'w') as f:
+with h5py.File('large_pushdown_test.h5', 'w', fs_strategy='page',
+               fs_page_size=16 * 1024 * 1024, fs_persist=True) as f:
+    # The two regular columns (int32 + float64) dominate the file size.
+    preallocate(f, NUM_ROWS * (4 + 8))
+
     # Regular column: 0, 1, 2, ..., NUM_ROWS-1
     print("\nCreating regular column...")
     regular = np.arange(NUM_ROWS, dtype=np.int32)
-    f.create_dataset('regular', data=regular, chunks=(1_000_000,))
+    f.create_dataset('regular', data=regular, chunks=(1_000_000,), track_times=False)
     print(f"  /regular: {len(regular):,} int32 values")
 
     # Regular float column: 0.0, 0.1, 0.2, ..., (NUM_ROWS-1)*0.1
     print("\nCreating regular float column...")
     regular_float = np.arange(NUM_ROWS, dtype=np.float64) * 0.1
-    f.create_dataset('regular_float', data=regular_float, chunks=(1_000_000,))
+    f.create_dataset('regular_float', data=regular_float, chunks=(1_000_000,), track_times=False)
     print(f"  /regular_float: {len(regular_float):,} float64 values")
 
     # Sorted int32 RSE: [10, 20, 30, 40, 50]
     print("\nCreating sorted int32 RSE columns...")
     int_rse_values = np.array([10, 20, 30, 40, 50], dtype=np.int32)
+    # All RSE variants below share these run boundaries; h5py copies the array
+    # into the file on each write, so the one object serves every dataset.
     int_rse_starts = np.array([0, ROWS_PER_RUN, 2 * ROWS_PER_RUN, 3 * ROWS_PER_RUN, 4 * ROWS_PER_RUN], dtype=np.uint64)
 
-    f.create_dataset('int_rse_starts', data=int_rse_starts)
-    f.create_dataset('int_rse_values', data=int_rse_values)
+    f.create_dataset('int_rse_starts', data=int_rse_starts, track_times=False)
+    f.create_dataset('int_rse_values', data=int_rse_values, track_times=False)
     print(f"  /int_rse_starts: {len(int_rse_starts)} runs")
     print(f"  /int_rse_values: {int_rse_values}")
 
     # Unsorted int32 RSE: [50, 10, 30, 20, 40]
     print("\nCreating unsorted int32 RSE columns...")
     int_unsorted_rse_values = np.array([50, 10, 30, 20, 40], dtype=np.int32)
-    int_unsorted_rse_starts = int_rse_starts.copy()
-
-    f.create_dataset('int_unsorted_rse_starts', data=int_unsorted_rse_starts)
-    f.create_dataset('int_unsorted_rse_values', data=int_unsorted_rse_values)
-    print(f"  /int_unsorted_rse_starts: {len(int_unsorted_rse_starts)} runs")
+    f.create_dataset('int_unsorted_rse_starts', data=int_rse_starts, track_times=False)
+    f.create_dataset('int_unsorted_rse_values', data=int_unsorted_rse_values, track_times=False)
+    print(f"  /int_unsorted_rse_starts: {len(int_rse_starts)} runs")
     print(f"  /int_unsorted_rse_values: {int_unsorted_rse_values}")
 
     # Sorted float RSE: [1.5, 2.5, 3.5, 4.5, 5.5]
     print("\nCreating sorted float RSE columns...")
     float_rse_values = np.array([1.5, 2.5, 3.5, 4.5, 5.5], dtype=np.float64)
-    float_rse_starts = int_rse_starts.copy()
-
-    f.create_dataset('float_rse_starts', data=float_rse_starts)
-    f.create_dataset('float_rse_values', data=float_rse_values)
-    print(f"  /float_rse_starts: {len(float_rse_starts)} runs")
+    f.create_dataset('float_rse_starts', data=int_rse_starts, track_times=False)
+    f.create_dataset('float_rse_values', data=float_rse_values, track_times=False)
+    print(f"  /float_rse_starts: {len(int_rse_starts)} runs")
     print(f"  /float_rse_values: {float_rse_values}")
 
     # Sorted int64 RSE: [100, 200, 300, 400, 500]
     print("\nCreating sorted int64 RSE columns...")
     int64_rse_values = np.array([100, 200, 300, 400, 500], dtype=np.int64)
-    int64_rse_starts = int_rse_starts.copy()
-
-    f.create_dataset('int64_rse_starts', data=int64_rse_starts)
-    f.create_dataset('int64_rse_values', data=int64_rse_values)
-    print(f"  /int64_rse_starts: {len(int64_rse_starts)} runs")
+    f.create_dataset('int64_rse_starts', data=int_rse_starts, track_times=False)
+    f.create_dataset('int64_rse_values', data=int64_rse_values, track_times=False)
+    print(f"  /int64_rse_starts: {len(int_rse_starts)} runs")
     print(f"  /int64_rse_values: {int64_rse_values}")
 
     # Sorted uint32 RSE: [1000, 2000, 3000, 4000, 5000]
     print("\nCreating sorted uint32 RSE columns...")
     uint32_rse_values = np.array([1000, 2000, 3000, 4000, 5000], dtype=np.uint32)
-    uint32_rse_starts = int_rse_starts.copy()
-
-    f.create_dataset('uint32_rse_starts', data=uint32_rse_starts)
-    f.create_dataset('uint32_rse_values', data=uint32_rse_values)
-    print(f"  /uint32_rse_starts: {len(uint32_rse_starts)} runs")
+    f.create_dataset('uint32_rse_starts', data=int_rse_starts, track_times=False)
+    f.create_dataset('uint32_rse_values', data=uint32_rse_values, track_times=False)
+    print(f"  /uint32_rse_starts: {len(int_rse_starts)} runs")
     print(f"  /uint32_rse_values: {uint32_rse_values}")
 
     # String RSE: ["alpha", "beta", "gamma", "delta", "epsilon"]
     print("\nCreating string RSE columns...")
     string_rse_values = np.array(["alpha", "beta", "gamma", "delta", "epsilon"], dtype='S10')
-    string_rse_starts = int_rse_starts.copy()
-
-    f.create_dataset('string_rse_starts', data=string_rse_starts)
-    f.create_dataset('string_rse_values', data=string_rse_values)
-    print(f"  /string_rse_starts: {len(string_rse_starts)} runs")
-    print(f"  /string_rse_values: {[s.decode() for s in string_rse_values]}")
+    f.create_dataset('string_rse_starts', data=int_rse_starts, track_times=False)
+    f.create_dataset('string_rse_values', data=string_rse_values, track_times=False)
+    print(f"  /string_rse_starts: {len(int_rse_starts)} runs")
+    print(f"  /string_rse_values: {string_rse_values}")
+
+    # Dictionary-encoded companion: the unique strings once, plus int32 codes
+    # per run. Predicates on the string column can then be evaluated as
+    # integer compares against the codes and only decoded via the dict.
+    string_rse_codes = np.arange(len(string_rse_values), dtype=np.int32)
+    f.create_dataset('string_rse_dict', data=string_rse_values, track_times=False)
+    f.create_dataset('string_rse_codes', data=string_rse_codes, track_times=False)
+    print(f"  /string_rse_dict + /string_rse_codes: {len(string_rse_values)} entries")
 
     # Add metadata
     f.attrs['description'] = 'Large-scale predicate pushdown test file'
@@ -18,37 +18,83 @@ Test scenarios:
 import h5py
 import numpy as np
 
+from write_utils import parallel_arange, preallocate
+
+# Scenario sizes, gathered up front so the preallocation floor below can be
+# computed before any dataset is written.
+NUM_SINGLE_ENTRY = 1_000_000
+CHUNK_SIZE = 2048
+NUM_CHUNKS = 5000  # 5000 chunks = 10.24M rows
+NUM_CHUNK_ALIGNED = NUM_CHUNKS * CHUNK_SIZE
+NUM_SINGLE_RUN = 10_000_000
+NUM_ALTERNATING = 10_000_000
+NUM_MID_CHUNK = 10_000_000
+NUM_SMALL_RUNS = 10_000_000
+AVG_RUN_LENGTH = 100
+NUM_TYPES = 5_000_000
+
+# The int32 index columns dominate the raw bytes; everything else (run
+# starts, values) is comparatively tiny, so this undershoots the final file
+# size and the reservation never over-allocates.
+_RAW_FLOOR = 4 * (NUM_SINGLE_ENTRY + NUM_CHUNK_ALIGNED + NUM_SINGLE_RUN
+                  + NUM_ALTERNATING + NUM_MID_CHUNK + NUM_SMALL_RUNS + 3 * NUM_TYPES)
+
+
 print("Creating large-scale RSE edge cases test file...")
 
-with h5py.File('large_rse_edge_cases.h5', 'w') as f:
+# The raised rdcc_nbytes holds ~30 of the 8 MB chunks in flight; the prime
+# slot count keeps the many tiny run_starts/values chunks from colliding in
+# the cache's hash table.
+with h5py.File('large_rse_edge_cases.h5', 'w', fs_strategy='page',
+               fs_page_size=16 * 1024 * 1024, fs_persist=True,
+               rdcc_nbytes=256 * 1024 * 1024, rdcc_nslots=100_003, rdcc_w0=0.75) as f:
+
+    preallocate(f, _RAW_FLOOR)
+
+    # Convention throughout: bind every h5py group to a local (grp, grp_float,
+    # ...) and go through that local for all dataset creation. Indexing the
+    # file again (f['group']['dataset']) builds a fresh Python object plus
+    # backing C identifiers on every access.
 
     # ==========================================================================
     # Test 1: Single Row Dataset (unchanged from small version)
     # ==========================================================================
     print("\n1. Creating single row dataset...")
+    # The reader addresses run_starts/values as dataset paths, so these stay
+    # real datasets; compact layout packs the handful of bytes into the object
+    # header instead of a separate contiguous allocation.
+    _COMPACT = h5py.h5p.create(h5py.h5p.DATASET_CREATE)
+    _COMPACT.set_layout(h5py.h5d.COMPACT)
+    _COMPACT.set_obj_track_times(False)
+
+    def _create_compact(grp, name, data):
+        space = h5py.h5s.create_simple(data.shape)
+        dset = h5py.h5d.create(grp.id, name.encode(),
+                               h5py.h5t.py_create(data.dtype, logical=True), space, dcpl=_COMPACT)
+        dset.write(h5py.h5s.ALL, h5py.h5s.ALL, data)
+
     grp = f.create_group('single_row')
-    grp.create_dataset('index', data=np.array([0], dtype=np.int32))
-    grp.create_dataset('run_starts', data=np.array([0], dtype=np.uint64))
-    grp.create_dataset('values', data=np.array([42], dtype=np.int32))
+    _create_compact(grp, 'index', np.array([0], dtype=np.int32))
+    _create_compact(grp, 'run_starts', np.array([0], dtype=np.uint64))
+    _create_compact(grp, 'values', np.array([42], dtype=np.int32))
     print("  /single_row: 1 row")
 
     # ==========================================================================
     # Test 2: Single-Entry Runs (1M rows, worst case for RLE)
     # ==========================================================================
     print("\n2. Creating single-entry runs (1M rows)...")
-    NUM_SINGLE_ENTRY = 1_000_000
     grp = f.create_group('single_entry_runs')
 
     # Index column
-    index = np.arange(NUM_SINGLE_ENTRY, dtype=np.int32)
-    grp.create_dataset('index', data=index, chunks=(100_000,))
+    index = parallel_arange(NUM_SINGLE_ENTRY, np.int32)
+    grp.create_dataset('index', data=index, chunks=(100_000,), track_times=False)
 
     # Every row is a different run - values cycle through 1000-1999
     run_starts = np.arange(NUM_SINGLE_ENTRY, dtype=np.uint64)
     values = (np.arange(NUM_SINGLE_ENTRY, dtype=np.int32) % 1000) + 1000
 
-    grp.create_dataset('run_starts', data=run_starts, chunks=(100_000,))
-    grp.create_dataset('values', data=values, chunks=(100_000,))
+    grp.create_dataset('run_starts', data=run_starts, chunks=(100_000,), track_times=False)
+    grp.create_dataset('values', data=values, chunks=(100_000,), track_times=False)
     print(f"  /single_entry_runs: {NUM_SINGLE_ENTRY:,} rows, {NUM_SINGLE_ENTRY:,} runs")
     print(f"  Values range: {values.min()}-{values.max()}")
 
@@ -56,22 +102,18 @@ with h5py.File('large_rse_edge_cases.h5', 'w') as f:
     # Test 3: Chunk-Aligned Runs (2048-row aligned chunks)
     # ==========================================================================
     print("\n3. Creating chunk-aligned runs...")
-    CHUNK_SIZE = 2048
-    NUM_CHUNKS = 5000  # 5000 chunks = 10.24M rows
-    NUM_CHUNK_ALIGNED = NUM_CHUNKS * CHUNK_SIZE
-
     grp = f.create_group('chunk_aligned')
 
     # Index column
-    index = np.arange(NUM_CHUNK_ALIGNED, dtype=np.int32)
-    grp.create_dataset('index', data=index, chunks=(CHUNK_SIZE * 100,))
+    index = parallel_arange(NUM_CHUNK_ALIGNED, np.int32)
+    grp.create_dataset('index', data=index, chunks=(CHUNK_SIZE * 100,), track_times=False)
 
     # Each chunk is a single run, cycling through values 1-10
     run_starts = np.arange(0, NUM_CHUNK_ALIGNED, CHUNK_SIZE, dtype=np.uint64)
     values = (np.arange(NUM_CHUNKS, dtype=np.int32) % 10) + 1
 
-    grp.create_dataset('run_starts', data=run_starts, chunks=(min(10_000, NUM_CHUNKS),))
-    grp.create_dataset('values', data=values, chunks=(min(10_000, NUM_CHUNKS),))
+    grp.create_dataset('run_starts', data=run_starts, chunks=(min(10_000, NUM_CHUNKS),), track_times=False)
+    grp.create_dataset('values', data=values, chunks=(min(10_000, NUM_CHUNKS),), track_times=False)
     print(f"  /chunk_aligned: {NUM_CHUNK_ALIGNED:,} rows, {NUM_CHUNKS:,} runs")
     print(f"  Each run is exactly {CHUNK_SIZE} rows (STANDARD_VECTOR_SIZE)")
 
@@ -79,20 +121,15 @@ with h5py.File('large_rse_edge_cases.h5', 'w') as f:
     # Test 4: Large Single Run (10M rows, all same value)
     # ==========================================================================
     print("\n4. Creating large single run (10M rows)...")
-    NUM_SINGLE_RUN = 10_000_000
-
     grp = f.create_group('large_single_run')
 
     # Index column
-    index = np.arange(NUM_SINGLE_RUN, dtype=np.int32)
-    grp.create_dataset('index', data=index, chunks=(1_000_000,))
+    index = parallel_arange(NUM_SINGLE_RUN, np.int32)
+    grp.create_dataset('index', data=index, chunks=(1_000_000,), track_times=False)
 
     # All 10M rows have value 777
-    run_starts = np.array([0], dtype=np.uint64)
-    values = np.array([777], dtype=np.int32)
-
-    grp.create_dataset('run_starts', data=run_starts)
-    grp.create_dataset('values', data=values)
+    _create_compact(grp, 'run_starts', np.array([0], dtype=np.uint64))
+    _create_compact(grp, 'values', np.array([777], dtype=np.int32))
     print(f"  /large_single_run: {NUM_SINGLE_RUN:,} rows, 1 run (all value=777)")
     print(f"  Tests CONSTANT_VECTOR optimization across all chunks")
 
@@ -100,22 +137,21 @@ with h5py.File('large_rse_edge_cases.h5', 'w') as f:
     # Test 5: Alternating Runs (every 2048 rows)
     # ==========================================================================
     print("\n5. Creating alternating runs...")
-    NUM_ALTERNATING = 10_000_000
     RUN_LENGTH = 2048
 
     grp = f.create_group('alternating_runs')
 
     # Index column
-    index = np.arange(NUM_ALTERNATING, dtype=np.int32)
-    grp.create_dataset('index', data=index, chunks=(1_000_000,))
+    index = parallel_arange(NUM_ALTERNATING, np.int32)
+    grp.create_dataset('index', data=index, chunks=(1_000_000,), track_times=False)
 
     # Alternating between values 100 and 200 every 2048 rows
     run_starts = np.arange(0, NUM_ALTERNATING, RUN_LENGTH, dtype=np.uint64)
     num_runs = len(run_starts)  # Use actual length to avoid mismatch
-    values = np.array([100 if i % 2 == 0 else 200 for i in range(num_runs)], dtype=np.int32)
+    values = np.where(np.arange(num_runs) % 2 == 0, 100, 200).astype(np.int32)
 
-    grp.create_dataset('run_starts', data=run_starts, chunks=(min(10_000, len(run_starts)),))
-    grp.create_dataset('values', data=values, chunks=(min(10_000, len(values)),))
+    grp.create_dataset('run_starts', data=run_starts, chunks=(min(10_000, len(run_starts)),), track_times=False)
+    grp.create_dataset('values', data=values, chunks=(min(10_000, len(values)),), track_times=False)
     print(f"  /alternating_runs: {NUM_ALTERNATING:,} rows, {num_runs:,} runs")
     print(f"  Alternates between 100 and 200 every {RUN_LENGTH} rows")
 
@@ -123,22 +159,21 @@ with h5py.File('large_rse_edge_cases.h5', 'w') as f:
     # Test 6: Mid-Chunk Boundaries
     # ==========================================================================
     print("\n6. Creating mid-chunk boundaries...")
-    NUM_MID_CHUNK = 10_000_000
     RUN_LENGTH = 1500  # Not aligned with 2048
 
     grp = f.create_group('mid_chunk_boundaries')
 
     # Index column
-    index = np.arange(NUM_MID_CHUNK, dtype=np.int32)
-    grp.create_dataset('index', data=index, chunks=(1_000_000,))
+    index = parallel_arange(NUM_MID_CHUNK, np.int32)
+    grp.create_dataset('index', data=index, chunks=(1_000_000,), track_times=False)
 
     # Runs of 1500 rows each, cycling through values 10-19
     num_runs = NUM_MID_CHUNK // RUN_LENGTH + 1
     run_starts = np.arange(0, NUM_MID_CHUNK, RUN_LENGTH, dtype=np.uint64)
     values = (np.arange(num_runs, dtype=np.int32) % 10) + 10
 
-    grp.create_dataset('run_starts', data=run_starts, chunks=(min(10_000, len(run_starts)),))
-    grp.create_dataset('values', data=values[: len(run_starts)], chunks=(min(10_000, len(run_starts)),))
+    grp.create_dataset('run_starts', data=run_starts, chunks=(min(10_000, len(run_starts)),), track_times=False)
+    grp.create_dataset('values', data=values[: len(run_starts)], chunks=(min(10_000, len(run_starts)),), track_times=False)
     print(f"  /mid_chunk_boundaries: {NUM_MID_CHUNK:,} rows, {len(run_starts):,} runs")
     print(f"  Each run is {RUN_LENGTH} rows (not aligned with 2048)")
 
@@ -146,26 +181,28 @@ with h5py.File('large_rse_edge_cases.h5', 'w') as f:
     # Test 7: Many Small Runs (avg 100 rows/run over 10M rows)
     # ==========================================================================
     print("\n7. Creating many small runs...")
-    NUM_SMALL_RUNS = 10_000_000
-    AVG_RUN_LENGTH = 100
-
     grp = f.create_group('many_small_runs')
 
     # Index column
-    index = np.arange(NUM_SMALL_RUNS, dtype=np.int32)
-    grp.create_dataset('index', data=index, chunks=(1_000_000,))
+    index = parallel_arange(NUM_SMALL_RUNS, np.int32)
+    grp.create_dataset('index', data=index, chunks=(1_000_000,), track_times=False)
 
     # Varying run lengths around 100 (50-150 rows per run)
     np.random.seed(42)
     run_lengths = np.random.randint(50, 150, NUM_SMALL_RUNS // AVG_RUN_LENGTH)
-    run_starts = np.concatenate([[0], np.cumsum(run_lengths)[:-1]]).astype(np.uint64)
-
-    # Trim to fit exactly NUM_SMALL_RUNS
-    run_starts = run_starts[run_starts < NUM_SMALL_RUNS]
-    values = (np.arange(len(run_starts), dtype=np.int32) % 500) + 500
 
-    grp.create_dataset('run_starts', data=run_starts, chunks=(min(10_000, len(run_starts)),))
-    grp.create_dataset('values', data=values, chunks=(min(10_000, len(values)),))
+    # The cumulative sums are sorted, so the number of runs that fit inside
+    # NUM_SMALL_RUNS falls straight out of a binary search; cumsum then fills
+    # run_starts in place, skipping the concatenate + boolean-mask copies.
+    cumulative = np.cumsum(run_lengths[:-1])
+    num_runs = 1 + int(np.searchsorted(cumulative, NUM_SMALL_RUNS, side='left'))
+    run_starts = np.empty(num_runs, dtype=np.uint64)
+    run_starts[0] = 0
+    np.cumsum(run_lengths[: num_runs - 1], out=run_starts[1:])
+    values = (np.arange(num_runs, dtype=np.int32) % 500) + 500
+
+    grp.create_dataset('run_starts', data=run_starts, chunks=(min(10_000, len(run_starts)),), track_times=False)
+    grp.create_dataset('values', data=values, chunks=(min(10_000, len(values)),), track_times=False)
     print(f"  /many_small_runs: {NUM_SMALL_RUNS:,} rows, {len(run_starts):,} runs")
     print(f"  Average run length: ~{AVG_RUN_LENGTH} rows")
 
@@ -173,43 +210,50 @@ with h5py.File('large_rse_edge_cases.h5', 'w') as f:
     # Test 8: Different Data Types at Scale
     # ==========================================================================
     print("\n8. Creating different data types...")
-    NUM_TYPES = 5_000_000
     RUN_LENGTH = 10000  # 500 runs
 
+    # The three groups share identical index and run_starts contents; compute
+    # each array once and hand the same object to every create_dataset call.
+    index = parallel_arange(NUM_TYPES, np.int32)
+    num_runs = NUM_TYPES // RUN_LENGTH
+    run_starts = np.arange(0, NUM_TYPES, RUN_LENGTH, dtype=np.uint64)
+
     # Float64 RSE
     grp_float = f.create_group('large_float_rse')
-    index = np.arange(NUM_TYPES, dtype=np.int32)
-    grp_float.create_dataset('index', data=index, chunks=(500_000,))
+    grp_float.create_dataset('index', data=index, chunks=(500_000,), track_times=False)
 
-    num_runs = NUM_TYPES // RUN_LENGTH
-    run_starts = np.arange(0, NUM_TYPES, RUN_LENGTH, dtype=np.uint64)
     values = np.linspace(1.0, 100.0, num_runs, dtype=np.float64)
 
-    grp_float.create_dataset('run_starts', data=run_starts, chunks=(min(10_000, len(run_starts)),))
-    grp_float.create_dataset('values', data=values, chunks=(min(10_000, len(values)),))
+    grp_float.create_dataset('run_starts', data=run_starts, chunks=(min(10_000, len(run_starts)),), track_times=False)
+    grp_float.create_dataset('values', data=values, chunks=(min(10_000, len(values)),), track_times=False)
     print(f"  /large_float_rse: {NUM_TYPES:,} rows, {num_runs} runs (float64)")
 
     # String RSE
     grp_string = f.create_group('large_string_rse')
-    index = np.arange(NUM_TYPES, dtype=np.int32)
-    grp_string.create_dataset('index', data=index, chunks=(500_000,))
+    grp_string.create_dataset('index', data=index, chunks=(500_000,), track_times=False)
+
+    # Cycle through "value_000" to "value_499"; np.char.mod formats the whole
+    # array in one C-level pass instead of a per-element Python loop.
+    string_values = np.char.mod(b'value_%03d', np.arange(num_runs)).astype('S20')
 
-    # Cycle through "value_000" to "value_499"
-    string_values = np.array([f"value_{i:03d}" for i in range(num_runs)], dtype='S20')
+    grp_string.create_dataset('run_starts', data=run_starts, chunks=(min(10_000, len(run_starts)),), track_times=False)
+    grp_string.create_dataset('values', data=string_values, chunks=(min(10_000, len(string_values)),), track_times=False)
 
-    grp_string.create_dataset('run_starts', data=run_starts, chunks=(min(10_000, len(run_starts)),))
-    grp_string.create_dataset('values', data=string_values, chunks=(min(10_000, len(string_values)),))
+    # Dictionary-encoded companion to the fixed-width values: the unique
+    # strings once, plus int32 codes per run for integer-domain predicates.
+    grp_string.create_dataset('values_dict', data=string_values, track_times=False)
+    grp_string.create_dataset('values_codes', data=np.arange(num_runs, dtype=np.int32),
+                              chunks=(min(10_000, num_runs),), track_times=False)
     print(f"  /large_string_rse: {NUM_TYPES:,} rows, {num_runs} runs (string)")
 
     # Int64 RSE
     grp_int64 = f.create_group('large_int64_rse')
-    index = np.arange(NUM_TYPES, dtype=np.int32)
-    grp_int64.create_dataset('index', data=index, chunks=(500_000,))
+    grp_int64.create_dataset('index', data=index, chunks=(500_000,), track_times=False)
 
     values_int64 = np.arange(num_runs, dtype=np.int64) * 1000000
 
-    grp_int64.create_dataset('run_starts', data=run_starts, chunks=(min(10_000, len(run_starts)),))
-    grp_int64.create_dataset('values', data=values_int64, chunks=(min(10_000, len(values_int64)),))
+    grp_int64.create_dataset('run_starts', data=run_starts, chunks=(min(10_000, len(run_starts)),), track_times=False)
+    grp_int64.create_dataset('values', data=values_int64, chunks=(min(10_000, len(values_int64)),), track_times=False)
     print(f"  /large_int64_rse: {NUM_TYPES:,} rows, {num_runs} runs (int64)")
 
     # Add metadata
@@ -8,137 +8,217 @@ we should see multiple chunk fetches and parallel execution.
 Target: 10M rows = ~10 chunks of 8MB each (1M doubles per chunk)
 """
 
+import multiprocessing as mp
+import os
+
 import h5py
 import numpy as np
 
+from write_utils import preallocate, write_chunked
+
 # Target 10M rows to ensure multiple chunks and parallel execution
 NUM_ROWS = 10_000_000
+CHUNK_ROWS = 1_000_000
+
+# The log lines that report SUM/MEAN re-walk a full 40-80 MB array purely
+# for the print; only pay for that when explicitly asked.
+VERBOSE = os.environ.get('H5DB_VERBOSE') == '1'
+
+# One canonical ramp; every integer column below is derived from it one
+# chunk at a time, so peak RSS is bounded by this array plus a single
+# chunk-sized scratch buffer instead of a second full 10M-row copy per dtype.
+BASE = np.arange(NUM_ROWS, dtype=np.int64)
+
+# Raw dataset bytes per task, metadata excluded. Used as a preallocation
+# floor: the final files are always at least this large, so reserving this
+# much up front never over-allocates and nothing needs trimming at close.
+_RAW_BYTES = {
+    'floats': NUM_ROWS * 8,
+    'float_types': NUM_ROWS * (4 + 8 + 8),
+    'ramps': NUM_ROWS * 86
+             + min(NUM_ROWS, 1_000_000) * 96
+             + min(NUM_ROWS, 500_000) * 192,
+}
+
+
+def _write_derived(f, name, dtype, derive=None):
+    """Stream a 1D NUM_ROWS dataset derived chunk-at-a-time from BASE.
+
+    `derive` maps a BASE slice to the chunk's values (identity when omitted);
+    the result is cast to `dtype`, which wraps exactly like building the whole
+    column with np.arange(NUM_ROWS, dtype=dtype) would.
+    """
+    dset = f.create_dataset(name, shape=(NUM_ROWS,), dtype=dtype, chunks=(CHUNK_ROWS,), track_times=False)
+    for start in range(0, NUM_ROWS, CHUNK_ROWS):
+        chunk = BASE[start : start + CHUNK_ROWS]
+        if derive is not None:
+            chunk = derive(chunk)
+        chunk = np.ascontiguousarray(chunk.astype(dtype, copy=False))
+        dset.id.write_direct_chunk((start,), chunk.tobytes())
+    return dset
+
+
+def _write_ramp_nd(f, name, dtype, rows, inner_shape, chunk_shape):
+    """Row-major ramp reshaped to (rows, *inner_shape), streamed per chunk.
+
+    Equivalent to np.arange(rows * prod(inner_shape), dtype=dtype).reshape(...)
+    without ever materializing the full array.
+    """
+    width = int(np.prod(inner_shape))
+    inner_idx = np.arange(width, dtype=np.int64).reshape(inner_shape)
+    dset = f.create_dataset(name, shape=(rows,) + inner_shape, dtype=dtype, chunks=chunk_shape, track_times=False)
+    for start in range(0, rows, chunk_shape[0]):
+        count = min(chunk_shape[0], rows - start)
+        rows_idx = BASE[start : start + count].reshape((count,) + (1,) * len(inner_shape))
+        chunk = np.ascontiguousarray((rows_idx * width + inner_idx).astype(dtype, copy=False))
+        dset.id.write_direct_chunk((start,) + (0,) * len(inner_shape), chunk.tobytes())
+    return dset
+
+
+def _make_floats(f):
+    """The /floats column (its own RNG stream, seed 42)."""
+    rng = np.random.default_rng(42)
+    floats = np.empty(NUM_ROWS)
+    rng.random(out=floats)
+    write_chunked(f, 'floats', floats, (1_000_000,))
+    if VERBOSE:
+        print(f"  /floats: {len(floats):,} float64 values, MEAN={floats.mean():.6f}")
+    else:
+        print(f"  /floats: {len(floats):,} float64 values")
+
+
+def _make_float_types(f):
+    """float32/float64/data1 share one RNG stream (seed 43), so they stay
+    in a single worker to keep draw order - and therefore values - stable.
+    Generator.random fills the preallocated buffers directly - for float32
+    natively, with no float64 intermediate plus downcast pass."""
+    rng = np.random.default_rng(43)
+    float32_data = np.empty(NUM_ROWS, dtype=np.float32)
+    rng.random(out=float32_data, dtype=np.float32)
+    write_chunked(f, 'float32', float32_data, (1_000_000,))
+    print(f"  /float32: {len(float32_data):,} float32 values")
 
-print(f"Creating large-scale test file with {NUM_ROWS:,} rows...")
-print(f"Expected file size: ~{NUM_ROWS * 8 / 1024 / 1024:.0f} MB for doubles")
+    float64_data = np.empty(NUM_ROWS)
+    rng.random(out=float64_data)
+    write_chunked(f, 'float64', float64_data, (1_000_000,))
+    print(f"  /float64: {len(float64_data):,} float64 values")
+
+    data1 = np.empty(NUM_ROWS)
+    rng.random(out=data1)
+    write_chunked(f, 'data1', data1, (1_000_000,))
+    print(f"  /group1/data1: {len(data1):,} float64 values")
 
-with h5py.File('large_simple.h5', 'w') as f:
-    # 1D Numeric datasets
-    print("\nCreating 1D numeric datasets...")
 
+def _make_ramps(f):
+    """All deterministic ramp-derived datasets."""
     # Integers: 0, 1, 2, ..., NUM_ROWS-1
     # SUM = NUM_ROWS * (NUM_ROWS - 1) / 2
-    integers = np.arange(NUM_ROWS, dtype=np.int32)
-    f.create_dataset('integers', data=integers, chunks=(1_000_000,))
-    print(f"  /integers: {len(integers):,} int32 values, SUM={integers.sum():,}")
-
-    # Floats: random values in [0, 1)
-    np.random.seed(42)
-    floats = np.random.random(NUM_ROWS).astype(np.float64)
-    f.create_dataset('floats', data=floats, chunks=(1_000_000,))
-    print(f"  /floats: {len(floats):,} float64 values, MEAN={floats.mean():.6f}")
-
-    # 2D Array (matrix): shape (NUM_ROWS, 4)
-    print("\nCreating 2D array dataset...")
-    # Each row: [i*4, i*4+1, i*4+2, i*4+3]
-    matrix = np.arange(NUM_ROWS * 4, dtype=np.int32).reshape(NUM_ROWS, 4)
-    f.create_dataset('matrix', data=matrix, chunks=(250_000, 4))
-    print(f"  /matrix: shape {matrix.shape}, total SUM={matrix.sum():,}")
-
-    # Different integer types
-    print("\nCreating various integer type datasets...")
+    _write_derived(f, 'integers', np.int32)
+    if VERBOSE:
+        print(f"  /integers: {NUM_ROWS:,} int32 values, SUM={BASE.sum():,}")
+    else:
+        print(f"  /integers: {NUM_ROWS:,} int32 values")
 
-    # int8: cycling through -128 to 127
-    int8_data = np.arange(NUM_ROWS, dtype=np.int64) % 256 - 128
-    int8_data = int8_data.astype(np.int8)
-    f.create_dataset('int8', data=int8_data, chunks=(1_000_000,))
-    print(f"  /int8: {len(int8_data):,} int8 values")
+    # 2D Array (matrix): each row [i*4, i*4+1, i*4+2, i*4+3]
+    _write_ramp_nd(f, 'matrix', np.int32, NUM_ROWS, (4,), (250_000, 4))
+    print(f"  /matrix: shape {(NUM_ROWS, 4)}, total SUM={NUM_ROWS * 4 * (NUM_ROWS * 4 - 1) // 2:,}")
 
-    # int16
-    int16_data = np.arange(NUM_ROWS, dtype=np.int16) % 10000
-    f.create_dataset('int16', data=int16_data, chunks=(1_000_000,))
-    print(f"  /int16: {len(int16_data):,} int16 values")
-
-    # int64
-    int64_data = np.arange(NUM_ROWS, dtype=np.int64)
-    f.create_dataset('int64', data=int64_data, chunks=(1_000_000,))
-    print(f"  /int64: {len(int64_data):,} int64 values")
+    # int8: cycling through -128 to 127
+    _write_derived(f, 'int8', np.int8, lambda b: b % 256 - 128)
+    # int16: int16 wraparound of the ramp, then % 10000
+    _write_derived(f, 'int16', np.int16, lambda b: b.astype(np.int16) % 10000)
+    _write_derived(f, 'int64', np.int64)
+    print(f"  /int8, /int16, /int64: {NUM_ROWS:,} values each")
 
     # Unsigned integers
-    print("\nCreating unsigned integer type datasets...")
-
-    uint8_data = np.arange(NUM_ROWS, dtype=np.uint64) % 256
-    uint8_data = uint8_data.astype(np.uint8)
-    f.create_dataset('uint8', data=uint8_data, chunks=(1_000_000,))
-    print(f"  /uint8: {len(uint8_data):,} uint8 values, MAX={uint8_data.max()}")
-
-    uint16_data = np.arange(NUM_ROWS, dtype=np.uint16) % 10000
-    f.create_dataset('uint16', data=uint16_data, chunks=(1_000_000,))
-    print(f"  /uint16: {len(uint16_data):,} uint16 values")
-
-    uint32_data = np.arange(NUM_ROWS, dtype=np.uint32)
-    f.create_dataset('uint32', data=uint32_data, chunks=(1_000_000,))
-    print(f"  /uint32: {len(uint32_data):,} uint32 values")
-
-    # Float types
-    print("\nCreating float type datasets...")
+    _write_derived(f, 'uint8', np.uint8, lambda b: b % 256)
+    _write_derived(f, 'uint16', np.uint16, lambda b: b.astype(np.uint16) % 10000)
+    _write_derived(f, 'uint32', np.uint32)
+    print(f"  /uint8, /uint16, /uint32: {NUM_ROWS:,} values each, uint8 MAX={min(NUM_ROWS, 256) - 1}")
 
-    np.random.seed(43)
-    float32_data = np.random.random(NUM_ROWS).astype(np.float32)
-    f.create_dataset('float32', data=float32_data, chunks=(1_000_000,))
-    print(f"  /float32: {len(float32_data):,} float32 values")
-
-    float64_data = np.random.random(NUM_ROWS).astype(np.float64)
-    f.create_dataset('float64', data=float64_data, chunks=(1_000_000,))
-    print(f"  /float64: {len(float64_data):,} float64 values")
-
-    # Nested groups
-    print("\nCreating nested group structure...")
-
-    group1 = f.create_group('group1')
-
-    # group1/data1: float values
-    data1 = np.random.random(NUM_ROWS).astype(np.float64)
-    group1.create_dataset('data1', data=data1, chunks=(1_000_000,))
-    print(f"  /group1/data1: {len(data1):,} float64 values")
-
-    # group1/data2: integer values
-    data2 = np.arange(NUM_ROWS, dtype=np.int32)
-    group1.create_dataset('data2', data=data2, chunks=(1_000_000,))
-    print(f"  /group1/data2: {len(data2):,} int32 values")
-
-    # Nested subgroup
-    subgroup = group1.create_group('subgroup')
-    nested_data = np.arange(NUM_ROWS, dtype=np.int32)
-    subgroup.create_dataset('nested_data', data=nested_data, chunks=(1_000_000,))
-    print(f"  /group1/subgroup/nested_data: {len(nested_data):,} int32 values")
+    # Nested group members (merged under /group1 below)
+    _write_derived(f, 'data2', np.int32)
+    _write_derived(f, 'nested_data', np.int32)
+    print(f"  /group1/data2, /group1/subgroup/nested_data: {NUM_ROWS:,} int32 values each")
 
     # Multi-dimensional arrays
-    print("\nCreating multi-dimensional arrays...")
-
-    # 1D array
-    array_1d = np.arange(NUM_ROWS, dtype=np.int64)
-    f.create_dataset('array_1d', data=array_1d, chunks=(1_000_000,))
-    print(f"  /array_1d: shape {array_1d.shape}")
-
-    # 2D array: (NUM_ROWS, 4)
-    array_2d = np.arange(NUM_ROWS * 4, dtype=np.int64).reshape(NUM_ROWS, 4)
-    f.create_dataset('array_2d', data=array_2d, chunks=(250_000, 4))
-    print(f"  /array_2d: shape {array_2d.shape}")
-
-    # 3D array: (NUM_ROWS, 3, 4) - note: smaller for memory
-    # Only create subset to avoid huge file
+    _write_derived(f, 'array_1d', np.int64)
+    _write_ramp_nd(f, 'array_2d', np.int64, NUM_ROWS, (4,), (250_000, 4))
     array_3d_rows = min(NUM_ROWS, 1_000_000)  # Limit to 1M for 3D
-    array_3d = np.arange(array_3d_rows * 3 * 4, dtype=np.int64).reshape(array_3d_rows, 3, 4)
-    f.create_dataset('array_3d', data=array_3d, chunks=(100_000, 3, 4))
-    print(f"  /array_3d: shape {array_3d.shape}")
-
-    # 4D array: (NUM_ROWS, 2, 3, 4) - smaller subset
+    _write_ramp_nd(f, 'array_3d', np.int64, array_3d_rows, (3, 4), (100_000, 3, 4))
     array_4d_rows = min(NUM_ROWS, 500_000)  # Limit to 500K for 4D
-    array_4d = np.arange(array_4d_rows * 2 * 3 * 4, dtype=np.int64).reshape(array_4d_rows, 2, 3, 4)
-    f.create_dataset('array_4d', data=array_4d, chunks=(50_000, 2, 3, 4))
-    print(f"  /array_4d: shape {array_4d.shape}")
-
-    # Add metadata
-    f.attrs['description'] = 'Large-scale test file for parallel execution testing'
-    f.attrs['num_rows_1d'] = NUM_ROWS
-    f.attrs['created_by'] = 'create_large_simple.py'
-    f.attrs['purpose'] = 'Trigger DuckDB parallelism (>128K rows/thread) and multiple chunk fetches (8MB/chunk)'
-
-print(f"\nOK File created successfully!")
-print(f"Filename: large_simple.h5")
+    _write_ramp_nd(f, 'array_4d', np.int64, array_4d_rows, (2, 3, 4), (50_000, 2, 3, 4))
+    print(f"  /array_1d..4d: shapes {(NUM_ROWS,)}, {(NUM_ROWS, 4)}, "
+          f"{(array_3d_rows, 3, 4)}, {(array_4d_rows, 2, 3, 4)}")
+
+
+# Independent dataset families, each generated into its own scratch file by a
+# worker process (h5py handles cannot cross process boundaries) and merged
+# into large_simple.h5 below. Each entry: (task name, worker, {source dataset
+# in the scratch file: destination path in the final file}).
+TASKS = [
+    ('floats', _make_floats, {'floats': '/floats'}),
+    ('float_types', _make_float_types,
+     {'float32': '/float32', 'float64': '/float64', 'data1': '/group1/data1'}),
+    ('ramps', _make_ramps,
+     {'integers': '/integers', 'matrix': '/matrix',
+      'int8': '/int8', 'int16': '/int16', 'int64': '/int64',
+      'uint8': '/uint8', 'uint16': '/uint16', 'uint32': '/uint32',
+      'data2': '/group1/data2', 'nested_data': '/group1/subgroup/nested_data',
+      'array_1d': '/array_1d', 'array_2d': '/array_2d',
+      'array_3d': '/array_3d', 'array_4d': '/array_4d'}),
+]
+
+
+def _scratch_path(task_name):
+    return f'.large_simple_{task_name}.tmp.h5'
+
+
+def _run_task(task_name):
+    worker = {name: fn for name, fn, _ in TASKS}[task_name]
+    # A chunk cache well above the 8 MB max chunk lets h5py coalesce writes
+    # and flush whole chunks once instead of bypassing the default 1 MiB cache.
+    with h5py.File(_scratch_path(task_name), 'w',
+                   rdcc_nbytes=256 * 1024 * 1024, rdcc_nslots=100_003, rdcc_w0=0.75) as f:
+        preallocate(f, _RAW_BYTES[task_name])
+        worker(f)
+    return task_name
+
+
+def main():
+    print(f"Creating large-scale test file with {NUM_ROWS:,} rows...")
+    print(f"Expected file size: ~{NUM_ROWS * 8 / 1024 / 1024:.0f} MB for doubles")
+
+    # The random-number generation is CPU-bound, so the three dataset families
+    # run in parallel worker processes, each writing its own scratch file.
+    with mp.Pool(min(len(TASKS), os.cpu_count())) as pool:
+        pool.map(_run_task, [name for name, _, _ in TASKS])
+
+    # Merge the scratch files into the single final artifact; h5o.copy moves
+    # each dataset wholesale without decoding chunks.
+    print("\nMerging into large_simple.h5...")
+    with h5py.File('large_simple.h5', 'w', fs_strategy='page',
+                   fs_page_size=16 * 1024 * 1024, fs_persist=True) as f:
+        preallocate(f, sum(_RAW_BYTES.values()))
+        f.create_group('group1').create_group('subgroup')
+        for task_name, _, mapping in TASKS:
+            path = _scratch_path(task_name)
+            with h5py.File(path, 'r') as src:
+                for src_name, dest in mapping.items():
+                    parent, _, dest_name = dest.rpartition('/')
+                    h5py.h5o.copy(src.id, src_name.encode(),
+                                  f[parent or '/'].id, dest_name.encode())
+            os.remove(path)
+
+        # Add metadata
+        f.attrs['description'] = 'Large-scale test file for parallel execution testing'
+        f.attrs['num_rows_1d'] = NUM_ROWS
+        f.attrs['created_by'] = 'create_large_simple.py'
+        f.attrs['purpose'] = 'Trigger DuckDB parallelism (>128K rows/thread) and multiple chunk fetches (8MB/chunk)'
+
+    print(f"\nOK File created successfully!")
+    print(f"Filename: large_simple.h5")
+
+
+if __name__ == '__main__':
+    main()
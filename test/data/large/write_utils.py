@@ -0,0 +1,86 @@
+"""Shared write helpers for the large fixture generators.
+
+The create_large_* scripts all want the same three things: reserve the
+file's extents before the first dataset write, and push bulk data into
+chunked datasets without going through H5Dwrite's selection/conversion
+pipeline more often than necessary. Keeping the helpers here means the
+per-dataset property-list setup is written (and tuned) once.
+"""
+
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+import h5py
+import numpy as np
+
+
+def preallocate(f, nbytes):
+    """Reserve the file's extents in one go and advise sequential writes.
+
+    Incremental extent allocation fragments a several-hundred-MB write on
+    ext4/XFS; one posix_fallocate on the file's own fd keeps it contiguous,
+    which is what these fixtures are later benchmarked reading. `nbytes`
+    should be a floor (raw dataset bytes only) - HDF5 does not trim excess
+    at close, so undershooting guarantees the final size is unchanged.
+    No-op off POSIX.
+    """
+    if not hasattr(os, 'posix_fallocate'):
+        return
+    fd = f.id.get_vfd_handle()
+    try:
+        os.posix_fallocate(fd, 0, nbytes)
+        os.posix_fadvise(fd, 0, 0, os.POSIX_FADV_SEQUENTIAL)
+    except OSError:
+        pass
+
+
+def parallel_arange(n, dtype, chunk=1_000_000):
+    """Fill a [0, n) ramp with a small thread pool.
+
+    np.arange runs single-threaded and is memory-bandwidth-bound on one
+    core; numpy releases the GIL during the C-level fill, so writing 1M-row
+    slices from several threads saturates multi-channel memory on larger
+    hosts. Small ramps take the plain serial path.
+    """
+    if n <= chunk:
+        return np.arange(n, dtype=dtype)
+    out = np.empty(n, dtype=dtype)
+
+    def fill(start):
+        stop = min(start + chunk, n)
+        out[start:stop] = np.arange(start, stop, dtype=dtype)
+
+    with ThreadPoolExecutor() as pool:
+        list(pool.map(fill, range(0, n, chunk)))
+    return out
+
+
+def write_chunked(f, name, data, chunk_shape):
+    """Create an empty chunked dataset and push whole chunks via write_direct_chunk.
+
+    The in-memory dtype always matches the on-disk dtype here and no filters
+    are enabled, so H5Dwrite's selection/conversion/filter pipeline is pure
+    overhead; write_direct_chunk makes each chunk a near-memcpy. `data` must
+    be an exact multiple of `chunk_shape` in the first dimension.
+    """
+    dset = f.create_dataset(name, shape=data.shape, dtype=data.dtype,
+                            chunks=chunk_shape, track_times=False)
+    rows = chunk_shape[0]
+    for start in range(0, data.shape[0], rows):
+        chunk = np.ascontiguousarray(data[start : start + rows])
+        dset.id.write_direct_chunk((start,) + (0,) * (data.ndim - 1), chunk.tobytes())
+    return dset
+
+
+def write_whole(grp, name, data, chunk_rows):
+    """Create an empty chunked dataset, then write the whole array at once.
+
+    create_dataset(data=...) funnels the array through an intermediate HDF5
+    buffer copy; a single write_direct straight from the contiguous source
+    skips that copy. Unlike write_chunked, the length need not be a chunk
+    multiple.
+    """
+    dset = grp.create_dataset(name, shape=data.shape, dtype=data.dtype,
+                              chunks=(chunk_rows,), track_times=False)
+    dset.write_direct(data)
+    return dset